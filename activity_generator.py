@@ -1,11 +1,18 @@
-import random
+import os
+import functools
 import json
 import re
+import numpy as np
+
+COLUMN_SEPARATOR = re.compile(r'\s{2,}')  # basestats columns are separated by two or more spaces
+rng = np.random.default_rng()  # every activity draw of this script comes from this generator, pass a seed to repeat a run
 
 def parse_basestats(file_path):
     """
     Parses the basestats file and returns a dictionary with event statistics.
-    Handles multi-word event names by splitting columns with two or more spaces.
+    Handles multi-word event names by splitting columns on tabs, or with two or more spaces
+    for files without tabs.
+    Within one process the result is memoized by path and modification time.
     
     Args:
         file_path (str): Path to the basestats.txt file.
@@ -14,63 +21,114 @@ def parse_basestats(file_path):
         dict: Dictionary where each key is an event name, and the value is another
               dictionary with mean, std_dev, min, max, weight, and type details.
     """
+    file_stat = os.stat(file_path)
+    basestats = cached_basestats(file_path, file_stat.st_mtime_ns, file_stat.st_size)
+
+    # Fresh dictionaries for the caller, the memoized result is never handed out to be modified
+    return {event_name: dict(stats) for event_name, stats in basestats.items()}
+
+@functools.lru_cache(maxsize=32)
+def cached_basestats(file_path, mtime_ns, size):
+    """
+    Parses one version of the basestats file for parse_basestats.
+    Only file_path is read, a new mtime_ns or size makes a new cache entry when the file is rewritten.
+    """
     basestats = {}
     with open(file_path, 'r') as f:
-        # Skip the header line
-        next(f)
-        for line in f:
-            # Use regex to split by two or more spaces
-            parts = re.split(r'\s{2,}', line.strip())
-            
-            # Only process lines with enough columns to be an event
-            if len(parts) >= 7:
-                event_name = parts[0]
-                mean = float(parts[1])
-                std_dev = float(parts[2])
-                min_val = float(parts[3]) if parts[3] != "0" else None
-                max_val = float(parts[4]) if parts[4] != "0" else None
-                weight = int(parts[5])
-                data_type = parts[6]
-
-                basestats[event_name] = {
-                    'mean': mean,
-                    'std_dev': std_dev,
-                    'min': min_val,
-                    'max': max_val,
-                    'weight': weight,
-                    'type': data_type
-                }
-    return basestats
+        lines = f.read().splitlines()  # whole file in one read
+
+    # Skip the header line
+    for line in lines[1:]:
+        # Split on the tabs save_basestats writes, legacy space aligned files by two or more spaces
+        if '\t' in line:
+            parts = [part.strip() for part in line.split('\t')]
+        else:
+            parts = COLUMN_SEPARATOR.split(line.strip())
+        
+        # Only process lines with enough columns to be an event
+        if len(parts) >= 7:
+            event_name = parts[0]
+            mean = float(parts[1])
+            std_dev = float(parts[2])
+            min_val = float(parts[3]) if parts[3] != "0" else None
+            max_val = float(parts[4]) if parts[4] != "0" else None
+            weight = int(parts[5])
+            data_type = parts[6]
+
+            basestats[event_name] = {
+                'mean': mean,
+                'std_dev': std_dev,
+                'min': min_val,
+                'max': max_val,
+                'weight': weight,
+                'type': data_type
+            }
 
-import random
-import json
-import statistics
+    return basestats
 
-def generate_daily_activity(basestats):
+def event_params(basestats):
     """
-    Generates daily activity for each event based on the stats provided in basestats.
+    Resolves the generation parameters of each event once, so the per-day loop needs no dict lookups.
 
     Args:
         basestats (dict): Dictionary of basestats with mean, std_dev, min, max, weight, and type.
 
     Returns:
-        dict: Dictionary of generated activity values for each event.
+        list: (event_name, mean, std_dev, min, max, type) tuples, with unset min/max replaced by their defaults.
     """
-    daily_activity = {}
+    params = []
     for event_name, stats in basestats.items():
-        mean = stats['mean']
-        std_dev = stats['std_dev']
         min_val = stats['min'] if stats['min'] is not None else 1  # Default to 1 if min is None
         max_val = stats['max'] if stats['max'] is not None else 10000
-        event_type = stats['type']
+        params.append((event_name, stats['mean'], stats['std_dev'], min_val, max_val, stats['type']))
+    return params
+
+def activity_columns(params, days):
+    """
+    Generates the activity values of every event for all days with a single vectorized normal draw.
+
+    Args:
+        params (list): Result of event_params(basestats).
+        days (int): Number of days to generate.
+
+    Returns:
+        tuple: (event_names, columns) where columns holds one list of daily values per event,
+               continuous values rounded to 2 decimal places and discrete values as integers.
+    """
+    params = [p for p in params if p[5] in ('C', 'D')]  # only continuous and discrete events are generated
+    event_names = [p[0] for p in params]
+    means = np.array([p[1] for p in params], dtype=np.float64)
+    std_devs = np.array([p[2] for p in params], dtype=np.float64)
+    mins = np.array([p[3] for p in params], dtype=np.float64)
+    maxs = np.array([p[4] for p in params], dtype=np.float64)
+    is_cont = [p[5] == 'C' for p in params]
+
+    # One draw for every day and event, each column with its own mean and std_dev
+    samples = rng.normal(means, std_devs, size=(days, len(params)))
+
+    # Clamp to [min, max], continuous before rounding, discrete after rounding to whole limits
+    cont_values = np.round(np.maximum(np.minimum(samples, maxs), mins), 2)
+    disc_values = np.maximum(np.minimum(np.rint(samples), np.trunc(maxs)), np.trunc(mins)).astype(np.int64)
+
+    columns = [cont_values[:, e].tolist() if is_cont[e] else disc_values[:, e].tolist() for e in range(len(params))]
+    return event_names, columns
+
+def generate_daily_activity(basestats, params=None):
+    """
+    Generates daily activity for each event based on the stats provided in basestats.
+
+    Args:
+        basestats (dict): Dictionary of basestats with mean, std_dev, min, max, weight, and type.
+        params (list): Optional result of event_params(basestats), precomputed once for many days.
+
+    Returns:
+        dict: Dictionary of generated activity values for each event.
+    """
+    if params is None:
+        params = event_params(basestats)
 
-        if event_type == 'C':  # Continuous
-            value = max(min(random.gauss(mean, std_dev), max_val), min_val)
-            daily_activity[event_name] = round(value, 2)
-        elif event_type == 'D':  # Discrete
-            value = int(round(random.gauss(mean, std_dev)))
-            daily_activity[event_name] = max(min(value, int(max_val)), int(min_val))
-    return daily_activity
+    event_names, columns = activity_columns(params, 1)
+    return {event_name: column[0] for event_name, column in zip(event_names, columns)}
 
 def generate_activities(basestats, days, output_file="all_activities.txt"):
     """
@@ -86,16 +144,21 @@ def generate_activities(basestats, days, output_file="all_activities.txt"):
     """
     all_activities = []
     print("Starting event generation...")
+    event_names, columns = activity_columns(event_params(basestats), days)  # all days generated at once
+    lines = []  # whole file, written at once after generation
+    day_header = "Day {} Activity:\n".format  # templates parsed once, not per line
+    activity_line = "{}: {}\n".format
+    for day, day_values in enumerate(zip(*columns) if columns else [()] * days, 1):
+        daily_activity = dict(zip(event_names, day_values))
+        all_activities.append(daily_activity)
+
+        # Format daily activity for the file
+        lines.append(day_header(day))
+        lines.extend(activity_line(event_name, value) for event_name, value in daily_activity.items())
+        lines.append("\n")
+
     with open(output_file, 'w') as f:
-        for day in range(1, days + 1):
-            daily_activity = generate_daily_activity(basestats)
-            all_activities.append(daily_activity)
-
-            # Write daily activity to file
-            f.write(f"Day {day} Activity:\n")
-            for event_name, value in daily_activity.items():
-                f.write(f"{event_name}: {value}\n")
-            f.write("\n")
+        f.write("".join(lines))
     
     print("Event generation complete.")
     return all_activities
@@ -112,18 +175,18 @@ def analyze_activities(all_activities):
     """
     print("Starting analysis phase...")
     analysis_results = {}
-    # Gather all values for each event across all days
-    event_totals = {}
-    for daily_activity in all_activities:
-        for event_name, value in daily_activity.items():
-            if event_name not in event_totals:
-                event_totals[event_name] = []
-            event_totals[event_name].append(value)
-    
-    # Calculate mean and std deviation for each event
-    for event_name, values in event_totals.items():
-        mean = round(statistics.mean(values), 2)
-        std_dev = round(statistics.stdev(values), 2) if len(values) > 1 else 0.0  # Avoid stdev error with single value
+    # Stack all days into a (days, events) array, every day holds the same events
+    event_names = list(all_activities[0]) if all_activities else []
+    values = np.array([[daily_activity[event_name] for event_name in event_names] for daily_activity in all_activities])
+
+    # Calculate mean and std deviation for each event with single reductions over all days
+    means = values.mean(axis=0).tolist() if event_names else []
+    std_devs = values.std(axis=0, ddof=1).tolist() if len(all_activities) > 1 else [0.0] * len(event_names)  # Avoid stdev error with single value
+    for e, event_name in enumerate(event_names):
+        mean = round(means[e], 2)
+        if isinstance(all_activities[0][event_name], int) and means[e].is_integer():
+            mean = int(means[e])  # whole means of discrete events stay integers, as statistics.mean returned them
+        std_dev = round(std_devs[e], 2)
         analysis_results[event_name] = {"mean": mean, "std_dev": std_dev}
         print(f"Analysis for {event_name}: Mean = {mean}, Std Dev = {std_dev}")
     